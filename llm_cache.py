@@ -0,0 +1,102 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+
+def cache_key(**parts):
+    """
+    Builds a stable cache key from JSON-serializable request parts.
+
+    Parameters:
+    - parts: The parts identifying a deterministic call, e.g. model, messages and tools
+      for an LLM call, or function name and arguments for a tool call.
+
+    Returns:
+    - str: The sha256 hex digest of the parts.
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    Exact-match cache for outputs of deterministic calls, held in an in-process LRU and optionally shared through Redis.
+    """
+
+    def __init__(self, maxsize=512, ttl=None, redis_url=None, prefix="llm_cache:"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.prefix = prefix
+        self.entries = OrderedDict()
+        self.redis = None
+
+        if redis_url:
+            if redis is None:
+                logging.error("REDIS_URL is set but the redis package is not installed")
+            else:
+                self.redis = redis.from_url(redis_url)
+
+    async def get(self, key):
+        """
+        Retrieves a cached value.
+
+        Parameters:
+        - key (str): The cache key.
+
+        Returns:
+        - str: The cached value, or None on a miss.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.time():
+                self.entries.move_to_end(key)
+                return value
+            del self.entries[key]
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(self.prefix + key)
+            except redis.RedisError as e:
+                logging.error("Failed to read from Redis: %s", e)
+                return None
+            if value is not None:
+                value = value.decode()
+                self._remember(key, value)
+                return value
+        return None
+
+    async def set(self, key, value):
+        """
+        Stores a value in the cache.
+
+        Parameters:
+        - key (str): The cache key.
+        - value (str): The value to cache.
+        """
+        self._remember(key, value)
+        if self.redis is not None:
+            try:
+                await self.redis.set(self.prefix + key, value, ex=self.ttl)
+            except redis.RedisError as e:
+                logging.error("Failed to write to Redis: %s", e)
+
+    async def close(self):
+        """
+        Closes the Redis connection, if any.
+        """
+        if self.redis is not None:
+            await self.redis.aclose()
+
+    def _remember(self, key, value):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
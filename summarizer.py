@@ -1,10 +1,20 @@
+import asyncio
 import os
-import requests
 import json
-import time
 import logging
+import pickle
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+import diskcache
+import httpx
+import ijson
+import numpy as np
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, BadRequestError
+from llm_cache import LLMCache, cache_key
 
 # Load environment variables
 load_dotenv()
@@ -19,11 +29,87 @@ news_api_key = os.getenv("NEWS_API_KEY")
 openai_api_key = os.getenv("OPENAI_API_KEY")
 model = "gpt-3.5-turbo-16k"
 
+news_api_url = "https://newsapi.org/v2/everything"
+news_api_headers = {"X-Api-Key": news_api_key or ""}
+
+# NewsAPI connect/read timeouts, and retries with exponential backoff on transient errors
+news_api_timeout = httpx.Timeout(10.0, connect=3.05)
+news_api_retries = 3
+news_api_backoff = 0.3
+news_api_retry_statuses = {429, 500, 502, 503, 504}
+embedding_model = "text-embedding-3-small"
+
+# On-disk cache location and how long cached summaries stay valid, in seconds
+cache_dir = ".cache"
+cache_ttl = 24 * 60 * 60
+
+# Minimum cosine similarity for content to reuse a cached summary, and how many
+# summaries the semantic cache holds before dropping the oldest
+similarity_threshold = 0.92
+semantic_cache_size = 10000
+
+# Initial and maximum delay in seconds between run status polls
+poll_interval = 0.25
+max_poll_interval = 4.0
+
+# Run statuses after which a run will make no further progress
+failed_run_statuses = {"failed", "cancelled", "expired"}
+
+# Longest article content, in characters, sent to the model, and the most article
+# content sent in one batched summary request so it fits the model's context
+max_content_chars = 6000
+max_batch_chars = 24000
+
+# NewsAPI truncation marker, e.g. "[+1234 chars]", and runs of whitespace
+_truncation_marker = re.compile(r"\[\+\d+ chars\]$")
+_whitespace = re.compile(r"\s+")
+
+# Number of per-user assistant managers kept alive for reuse
+max_cached_managers = 128
+
+# Upper bound on summaries requested from OpenAI at the same time
+max_concurrent_summaries = 8
+
+# Shared HTTP/2 connection pool for both NewsAPI and OpenAI requests
+_http = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
 # Initialize the OpenAI client
-client = OpenAI()
+client = AsyncOpenAI(http_client=_http)
+
 
+@dataclass(slots=True, frozen=True)
+class Article:
+    """
+    A news article returned by the NewsAPI.
+    """
+
+    title: str
+    author: str | None
+    url: str
+    source: str
+    content: str | None
+    description: str | None
 
-def get_news(topic):
+
+class _AsyncResponseReader:
+    """
+    Exposes the body of a streamed httpx response as an async file-like object for ijson.
+    """
+
+    def __init__(self, response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size=-1):
+        # ijson probes the reader with read(0) and discards the result
+        if size == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
+
+async def get_news_async(topic):
     """
     Fetches news articles based on a topic using the NewsAPI.
 
@@ -31,54 +117,379 @@ def get_news(topic):
     - topic (str): The topic to fetch news articles about.
 
     Returns:
-    - List of dictionaries containing news article details. Empty list if an error occurs.
+    - List of Article records. Empty list if an error occurs.
+    """
+    params = {"q": topic, "pageSize": 5}
+
+    for attempt in range(news_api_retries + 1):
+        try:
+            async with _http.stream(
+                "GET",
+                news_api_url,
+                params=params,
+                headers=news_api_headers,
+                timeout=news_api_timeout,
+            ) as response:
+                if response.status_code == 200:
+                    return await _read_articles(response)
+            error = f"HTTP {response.status_code}"
+            retryable = response.status_code in news_api_retry_statuses
+        except httpx.TransportError as e:
+            error = e
+            retryable = True
+        except Exception as e:
+            logging.error("Failed to fetch news: %s", e)
+            return []
+
+        if not retryable or attempt == news_api_retries:
+            logging.error("Failed to fetch news: %s", error)
+            return []
+        await asyncio.sleep(news_api_backoff * 2**attempt)
+
+
+async def _read_articles(response):
+    results = []
+    async for article in ijson.items_async(
+        _AsyncResponseReader(response), "articles.item"
+    ):
+        results.append(
+            Article(
+                title=article["title"],
+                author=article["author"],
+                url=article["url"],
+                source=article["source"]["name"],
+                content=article["content"],
+                description=article["description"],
+            )
+        )
+    return results
+
+
+class SemanticCache:
+    """
+    Caches summaries by the embedding of their source content, so near-duplicate content reuses an earlier summary.
+    """
+
+    def __init__(
+        self,
+        path,
+        threshold=similarity_threshold,
+        ttl=cache_ttl,
+        max_entries=semantic_cache_size,
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.emb_matrix = None
+        self.values = []
+        self.timestamps = []
+        self.load()
+
+    def load(self):
+        """
+        Loads the cache from disk, dropping entries older than the TTL.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+            emb_matrix = data["emb_matrix"]
+            values = list(data["values"])
+            timestamps = list(data["timestamps"])
+            if len(values) != len(timestamps) or (
+                len(values) != (0 if emb_matrix is None else len(emb_matrix))
+            ):
+                raise IndexError("entry counts do not match")
+        except (
+            OSError,
+            pickle.UnpicklingError,
+            EOFError,
+            KeyError,
+            IndexError,
+            TypeError,
+        ) as e:
+            logging.error("Failed to load semantic cache: %s", e)
+            return
+
+        self.emb_matrix = emb_matrix
+        self.values = values
+        self.timestamps = timestamps
+        self.prune()
+
+    def prune(self):
+        """
+        Drops entries older than the TTL, then the oldest entries beyond max_entries.
+        """
+        now = time.time()
+        start = 0
+        # Entries are appended in time order, so expired ones form a prefix
+        while start < len(self.timestamps) and now - self.timestamps[start] >= self.ttl:
+            start += 1
+        start = max(start, len(self.values) - self.max_entries)
+        if start == 0:
+            return
+        if start >= len(self.values):
+            self.emb_matrix = None
+        else:
+            self.emb_matrix = self.emb_matrix[start:]
+        self.values = self.values[start:]
+        self.timestamps = self.timestamps[start:]
+
+    def save(self):
+        """
+        Writes the cache to disk.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "wb") as f:
+            pickle.dump(
+                {
+                    "emb_matrix": self.emb_matrix,
+                    "values": self.values,
+                    "timestamps": self.timestamps,
+                },
+                f,
+            )
+
+    def get(self, embedding):
+        """
+        Looks up the summary of the most similar cached content.
+
+        Parameters:
+        - embedding (list): The embedding of the content to look up.
+
+        Returns:
+        - str: The cached summary, or None if nothing is similar enough.
+        """
+        if self.emb_matrix is None:
+            return None
+        sims = self.emb_matrix @ _normalize(embedding)
+        best = int(sims.argmax())
+        if sims[best] >= self.threshold:
+            return self.values[best]
+        return None
+
+    def set(self, embedding, summary):
+        """
+        Adds a summary to the cache.
+
+        Parameters:
+        - embedding (list): The embedding of the summarized content.
+        - summary (str): The summary to cache.
+        """
+        row = _normalize(embedding)[np.newaxis, :]
+        if self.emb_matrix is None:
+            self.emb_matrix = row
+        else:
+            self.emb_matrix = np.vstack([self.emb_matrix, row])
+        self.values.append(summary)
+        self.timestamps.append(time.time())
+        self.prune()
+
+
+def _normalize(embedding):
+    vector = np.asarray(embedding, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+# Semantic cache and summaries of articles already seen, keyed by article URL.
+# Opened on first use so that importing the module touches no files.
+_semantic_cache = None
+_summary_cache = None
+
+
+def _open_caches():
+    """
+    Opens the on-disk summary caches on first use.
+
+    Returns:
+    - tuple: The SemanticCache and the diskcache.Cache of summaries keyed by article URL.
+    """
+    global _semantic_cache, _summary_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(os.path.join(cache_dir, "semantic.pkl"))
+        _summary_cache = diskcache.Cache(os.path.join(cache_dir, "summaries"))
+    return _semantic_cache, _summary_cache
+
+
+# Exact-match cache of tool outputs, shared across processes when REDIS_URL is set
+tool_cache = LLMCache(ttl=cache_ttl, redis_url=os.getenv("REDIS_URL"))
+
+
+async def embed(contents):
+    """
+    Computes the embeddings of several pieces of text in a single request.
+
+    Parameters:
+    - contents (list): The texts to embed.
+
+    Returns:
+    - List of embedding vectors, in the same order as the texts.
+    """
+    response = await client.embeddings.create(model=embedding_model, input=contents)
+    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+async def summarize(content, model=model):
+    """
+    Summarizes a single piece of text with the chat completions API.
+
+    Parameters:
+    - content (str): The text to summarize.
+    - model (str): The model to use for the summary.
+
+    Returns:
+    - str: The generated summary.
     """
-    url = (
-        f"https://newsapi.org/v2/everything?q={topic}&apiKey={news_api_key}&pageSize=5"
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": "Summarize the following news article in a few sentences.",
+            },
+            {"role": "user", "content": content},
+        ],
     )
+    return response.choices[0].message.content
+
+
+async def summarize_batch(contents, model=model):
+    """
+    Summarizes several pieces of text with as few chat completions requests as possible.
+
+    Texts are grouped so each request carries at most max_batch_chars of content. A group
+    falls back to one request per text, bounded by max_concurrent_summaries, if its request
+    is rejected or the model's reply cannot be parsed into one summary per text.
+
+    Parameters:
+    - contents (list): The texts to summarize.
+    - model (str): The model to use for the summaries.
+
+    Returns:
+    - List of summaries, in the same order as the texts.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_summaries)
 
+    async def bounded_summarize(content):
+        async with semaphore:
+            return await summarize(content, model)
+
+    async def summarize_group(group):
+        summaries = await _summarize_group(group, model)
+        if summaries is None:
+            summaries = await asyncio.gather(
+                *(bounded_summarize(content) for content in group)
+            )
+        return summaries
+
+    groups = []
+    size = 0
+    for content in contents:
+        if not groups or size + len(content) > max_batch_chars:
+            groups.append([])
+            size = 0
+        groups[-1].append(content)
+        size += len(content)
+
+    results = await asyncio.gather(*(summarize_group(group) for group in groups))
+    return [summary for group in results for summary in group]
+
+
+async def _summarize_group(contents, model):
+    articles = "\n\n".join(
+        f"ARTICLE {i}:\n{content}" for i, content in enumerate(contents, start=1)
+    )
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            news_json = response.json()
-            articles = news_json["articles"]
-            results = []
-            for article in articles:
-                items = {
-                    "title": article["title"],
-                    "author": article["author"],
-                    "url": article["url"],
-                    "source": article["source"]["name"],
-                    "content": article["content"],
-                    "description": article["description"],
-                }
-                results.append(items)
-            return results
-        else:
-            logging.error("Failed to fetch news")
-            return []
+        response = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "Summarize each of the following news articles in a few sentences. "
+                        'Reply only with a JSON object of the form {"summaries": [...]} '
+                        "holding one summary string per article, in order."
+                    ),
+                },
+                {"role": "user", "content": articles},
+            ],
+        )
+    except BadRequestError as e:
+        logging.error("Batched summary request was rejected: %s", e)
+        return None
 
-    except Exception as e:
-        logging.error("Failed to fetch news: %s", e)
-        return []
+    try:
+        summaries = json.loads(response.choices[0].message.content)["summaries"]
+        if len(summaries) == len(contents) and all(
+            isinstance(summary, str) for summary in summaries
+        ):
+            return summaries
+        logging.error("Batched summary count does not match article count")
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        logging.error("Failed to parse batched summaries: %s", e)
+    return None
+
+
+def clean_content(content):
+    """
+    Strips the NewsAPI truncation marker and redundant whitespace from article content and caps its length.
 
+    Parameters:
+    - content (str): The article content as returned by the NewsAPI.
 
-def summarize_news(articles):
+    Returns:
+    - str: The cleaned content.
     """
-    Summarizes the content of news articles.
+    content = _truncation_marker.sub("", content.strip())
+    return _whitespace.sub(" ", content).strip()[:max_content_chars]
+
+
+async def summarize_news(articles):
+    """
+    Summarizes the content of news articles, reusing cached summaries of similar content.
 
     Parameters:
-    - articles (list): A list of dictionaries each containing details of a news article.
+    - articles (list): A list of Article records.
 
     Returns:
     - List of dictionaries with the article title and its summary.
     """
-    summaries = []
-    for article in articles:
-        if article["content"]:
-            summary = client.summarize(article["content"], model)
-            summaries.append({"title": article["title"], "summary": summary})
-    return summaries
+    semantic_cache, summary_cache = _open_caches()
+    # Clean before filtering, as content holding only the truncation marker cleans to ""
+    cleaned = [
+        (article, clean_content(article.content))
+        for article in articles
+        if article.content
+    ]
+    articles = [article for article, content in cleaned if content]
+    contents = [content for _, content in cleaned if content]
+    summaries = [summary_cache.get(article.url) for article in articles]
+    pending = [i for i, summary in enumerate(summaries) if summary is None]
+
+    if pending:
+        embeddings = await embed([contents[i] for i in pending])
+        misses = []
+        for i, embedding in zip(pending, embeddings):
+            summaries[i] = semantic_cache.get(embedding)
+            if summaries[i] is None:
+                misses.append((i, embedding))
+
+        if misses:
+            results = await summarize_batch([contents[i] for i, _ in misses], model)
+            for (i, embedding), summary in zip(misses, results):
+                summaries[i] = summary
+                semantic_cache.set(embedding, summary)
+            semantic_cache.save()
+
+        for i in pending:
+            summary_cache.set(articles[i].url, summaries[i], expire=cache_ttl)
+
+    return [
+        {"title": article.title, "summary": summary}
+        for article, summary in zip(articles, summaries)
+    ]
 
 
 class AssistantManager:
@@ -86,55 +497,65 @@ class AssistantManager:
     Manages interactions with the OpenAI assistant, including creating assistants, threads, and processing messages.
     """
 
-    thread_id = None
-    assistant_id = None
-
-    def __init__(self, model=model):
+    def __init__(self, model=model, assistant_id=None, thread_id=None):
         self.client = client
         self.model = model
+        self.assistant_id = assistant_id
+        self.thread_id = thread_id
         self.assistant = None
         self.thread = None
         self.run = None
         self.summary = None
 
-        # Retrieve existing assistant and thread if IDs are already created
-        if AssistantManager.assistant_id:
-            self.assistant = self.client.beta.assistant.retrieve(
-                assistant_id=AssistantManager.assistant_id
+    async def retrieve_existing(self):
+        """
+        Retrieves the existing assistant and thread if IDs are already created.
+        """
+        if self.assistant_id:
+            self.assistant = await self.client.beta.assistants.retrieve(
+                assistant_id=self.assistant_id
             )
-        if AssistantManager.thread_id:
-            self.thread = self.client.beta.assistant.thread.retrieve(
-                thread_id=AssistantManager.thread_id
+        if self.thread_id:
+            self.thread = await self.client.beta.threads.retrieve(
+                thread_id=self.thread_id
             )
 
-    def create_assistant(self, name, instructions, tools):
+    async def create_assistant(self, name, instructions, tools):
         """
-        Creates a new assistant if one does not already exist.
+        Creates a new assistant if one does not already exist, retrieving it instead if an assistant ID was given.
 
         Parameters:
         - name (str): The name of the assistant.
         - instructions (str): Instructions for the assistant.
         - tools (list): A list of tools the assistant can use.
         """
-        if not self.assistant:
-            assistant_obj = self.client.beta.assistants.create(
-                name=name, instructions=instructions, tools=tools, models=self.model
+        if not self.assistant and self.assistant_id:
+            self.assistant = await self.client.beta.assistants.retrieve(
+                assistant_id=self.assistant_id
+            )
+        elif not self.assistant:
+            assistant_obj = await self.client.beta.assistants.create(
+                name=name, instructions=instructions, tools=tools, model=self.model
             )
-            AssistantManager.assistant_id = assistant_obj.id
+            self.assistant_id = assistant_obj.id
             self.assistant = assistant_obj
             logging.info("Assistant ID: %s", self.assistant.id)
 
-    def create_thread(self):
+    async def create_thread(self):
         """
-        Creates a new thread if one does not already exist.
+        Creates a new thread if one does not already exist, retrieving it instead if a thread ID was given.
         """
-        if not self.thread:
-            thread_obj = self.client.beta.threads.create()
-            AssistantManager.thread_id = thread_obj.id
+        if not self.thread and self.thread_id:
+            self.thread = await self.client.beta.threads.retrieve(
+                thread_id=self.thread_id
+            )
+        elif not self.thread:
+            thread_obj = await self.client.beta.threads.create()
+            self.thread_id = thread_obj.id
             self.thread = thread_obj
             logging.info("Thread ID: %s", self.thread.id)
 
-    def add_message_to_thread(self, role, content):
+    async def add_message_to_thread(self, role, content):
         """
         Adds a message to the thread.
 
@@ -143,11 +564,11 @@ class AssistantManager:
         - content (str): The content of the message.
         """
         if self.thread:
-            self.client.beta.threads.messages.create(
+            await self.client.beta.threads.messages.create(
                 thread_id=self.thread.id, role=role, content=content
             )
 
-    def run_assistant(self, instructions):
+    async def run_assistant(self, instructions):
         """
         Initiates the assistant to process given instructions.
 
@@ -155,60 +576,72 @@ class AssistantManager:
         - instructions (str): The instructions for the assistant to process.
         """
         if self.thread and self.assistant:
-            self.run = self.client.beta.threads.runs.create(
+            self.run = await self.client.beta.threads.runs.create(
                 thread_id=self.thread.id,
                 assistant_id=self.assistant.id,
                 instructions=instructions,
             )
 
-    def process_messages(self):
+    async def process_messages(self):
         """
         Processes messages from the thread and compiles a summary.
         """
         if self.thread:
-            messages = self.client.beta.threads.messages.list(thread_id=self.thread.id)
-
-            summary = []
-            last_message = messages.data[0]
-            role = last_message.role
-            response = last_message.content[0].text.value
-            summary.append(response)
+            messages = await self.client.beta.threads.messages.list(
+                thread_id=self.thread.id
+            )
 
-            self.summary = "\n".join(summary)
+            # Only the first page is used, so iterating must not fetch further pages
+            msgs = list(messages.data)
+            last_message = msgs[0]
+            self.summary = last_message.content[0].text.value
             logging.info(
                 "SUMMARY ::::::=============> , ROLE : %s :==============> %s",
-                role.capitalize(),
-                response,
+                last_message.role.capitalize(),
+                self.summary,
+            )
+            logging.info(
+                "SUMMARY ================>: %s",
+                "\n".join(msg.content[0].text.value for msg in msgs),
             )
 
-            for msg in messages:
-                role = msg.role
-                content = msg.content[0].text.value
-                logging.info("SUMMARY ================>: %s", content)
-
-    def wait_for_completion(self):
+    async def wait_for_completion(self):
         """
         Waits for the assistant's processing to complete, handling any required actions.
+
+        Polls with exponential backoff, starting again from the shortest delay
+        after tool outputs are submitted. Stops once the run completes, fails,
+        is cancelled or expires.
         """
         if self.thread and self.run:
+            delay = poll_interval
             while True:
-                time.sleep(5)  # Polling interval
-                run_status = self.client.beta.threads.runs.retrieve(
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_poll_interval)
+                run_status = await self.client.beta.threads.runs.retrieve(
                     thread_id=self.thread.id, run_id=self.run.id
                 )
 
                 logging.info("RUN STATUS: %s", run_status.model_dump_json(indent=4))
 
                 if run_status.status == "completed":
-                    self.process_messages()
+                    await self.process_messages()
+                    break
+                elif run_status.status in failed_run_statuses:
+                    logging.error(
+                        "Run ended with status %s: %s",
+                        run_status.status,
+                        run_status.last_error,
+                    )
                     break
                 elif run_status.status == "requires_action":
                     logging.info("FUNCTION CALLING NOW...")
-                    self.call_required_functions(
+                    await self.call_required_functions(
                         required_actions=run_status.required_action.submit_tool_outputs.model_dump()
                     )
+                    delay = poll_interval
 
-    def call_required_functions(self, required_actions):
+    async def call_required_functions(self, required_actions):
         """
         Calls required functions based on the assistant's needs.
 
@@ -217,29 +650,44 @@ class AssistantManager:
         """
         if not self.run:
             return
-        tool_outputs = []
-        for action in required_actions["tool_calls"]:
-            func_name = action["function"]["name"]
-            arguments = json.loads(action["function"]["arguments"])
+        tool_outputs = await asyncio.gather(
+            *(self.call_function(action) for action in required_actions["tool_calls"])
+        )
 
-            if func_name == "get_news":
-                output = get_news(topic=arguments["topic"])
-                logging.info("STUFF: %s", output)
+        logging.info("Submitting outputs back to the Assistant...")
+        await self.client.beta.threads.runs.submit_tool_outputs(
+            thread_id=self.thread.id,
+            run_id=self.run.id,
+            tool_outputs=tool_outputs,
+        )
 
-                final_str = "".join(
-                    str(item) for item in output
-                )  # Fixed concatenation of dict items
+    async def call_function(self, action):
+        """
+        Calls a single function requested by the assistant.
 
-                tool_outputs.append({"tool_call_id": action["id"], "output": final_str})
-            else:
-                raise ValueError("Unknown function: %s", func_name)
+        Parameters:
+        - action (dict): The tool call requested by the assistant.
 
-            logging.info("Submitting outputs back to the Assistant...")
-            self.client.beta.threads.runs.submit_tool_outputs(
-                thread_id=self.thread.id,
-                run_id=self.run.id,
-                tool_outputs=tool_outputs,
-            )
+        Returns:
+        - dict: The tool output to submit for the call.
+        """
+        func_name = action["function"]["name"]
+        arguments = json.loads(action["function"]["arguments"])
+
+        if func_name == "get_news":
+            key = cache_key(function=func_name, arguments=arguments)
+            final_str = await tool_cache.get(key)
+            if final_str is None:
+                output = await get_news_async(arguments["topic"])
+                logging.info("STUFF: %s", output)
+
+                final_str = orjson.dumps(output).decode()
+                if output:
+                    await tool_cache.set(key, final_str)
+
+            return {"tool_call_id": action["id"], "output": final_str}
+        else:
+            raise ValueError(f"Unknown function: {func_name}")
 
     def get_summary(self):
         """
@@ -250,26 +698,63 @@ class AssistantManager:
         """
         return self.summary
 
-    def run_steps(self):
+    async def run_steps(self):
         """
         Retrieves and logs the steps run by the assistant.
         """
-        run_steps = self.client.beta.threads.runs.steps.list(
+        run_steps = await self.client.beta.threads.runs.steps.list(
             thread_id=self.thread.id, run_id=self.run.id
         )
         logging.info("RUN STEPS: %s", run_steps)
 
 
-def main():
+_managers = OrderedDict()
+
+
+def get_assistant_manager(user_id, model=model):
     """
-    Main function to fetch news on a topic and print the first article.
+    Returns the assistant manager for a user, creating one if it is not cached.
+
+    Least recently used managers are evicted once more than max_cached_managers are held.
+
+    Parameters:
+    - user_id (str): The user the manager belongs to.
+    - model (str): The model to use for a newly created manager.
+
+    Returns:
+    - AssistantManager: The user's assistant manager.
     """
-    news = get_news("Crypto")
-    if news:
-        logging.info(news[0])
+    manager = _managers.get(user_id)
+    if manager is None:
+        manager = AssistantManager(model=model)
+        _managers[user_id] = manager
+        if len(_managers) > max_cached_managers:
+            _managers.popitem(last=False)
     else:
-        logging.info("No news articles found.")
+        _managers.move_to_end(user_id)
+    return manager
+
+
+async def main(topics=("Crypto",)):
+    """
+    Main function to fetch news on each topic concurrently and print the first article of each.
+
+    Parameters:
+    - topics (iterable): The topics to fetch news articles about.
+    """
+    try:
+        results = await asyncio.gather(*(get_news_async(topic) for topic in topics))
+    finally:
+        await _http.aclose()
+        await tool_cache.close()
+        if _summary_cache is not None:
+            _summary_cache.close()
+    for topic, news in zip(topics, results):
+        if news:
+            logging.info(news[0])
+        else:
+            logging.info("No news articles found for %s.", topic)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
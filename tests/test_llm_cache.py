@@ -0,0 +1,46 @@
+import asyncio
+
+import llm_cache
+from llm_cache import LLMCache, cache_key
+
+
+def test_cache_key_is_stable_across_argument_order():
+    first = cache_key(
+        model="gpt", messages=[{"role": "user", "content": "hi"}], tools=None
+    )
+    second = cache_key(
+        tools=None, messages=[{"content": "hi", "role": "user"}], model="gpt"
+    )
+
+    assert first == second
+    assert first != cache_key(model="gpt", messages=[], tools=None)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now)
+    cache = LLMCache(ttl=60)
+
+    async def scenario():
+        nonlocal now
+        await cache.set("key", "value")
+        now += 59
+        assert await cache.get("key") == "value"
+        now += 2
+        assert await cache.get("key") is None
+
+    asyncio.run(scenario())
+    assert "key" not in cache.entries
+
+
+def test_least_recently_used_entry_is_evicted_at_maxsize():
+    cache = LLMCache(maxsize=2)
+
+    async def scenario():
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        assert await cache.get("a") == "1"
+        await cache.set("c", "3")
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == ["1", None, "3"]
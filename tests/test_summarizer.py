@@ -0,0 +1,378 @@
+import asyncio
+import json
+import os
+import pickle
+import re
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import summarizer  # noqa: E402
+
+NEWS_RESPONSE = {
+    "status": "ok",
+    "totalResults": 5,
+    "articles": [
+        {
+            "source": {"id": None, "name": f"Source {i}"},
+            "author": f"Author {i}",
+            "title": f"Title {i}",
+            "description": f"Description {i}",
+            "url": f"https://example.com/{i}",
+            "content": f"Content {i} [+1000 chars]",
+        }
+        for i in range(5)
+    ],
+}
+
+
+def mock_news_client(chunk_size):
+    """
+    Builds an HTTP client that streams the mocked NewsAPI body in chunks of the given size.
+    """
+    body = json.dumps(NEWS_RESPONSE).encode()
+
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
+    def handler(request):
+        return httpx.Response(200, content=chunks())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.parametrize("chunk_size", [50, 1 << 20])
+def test_get_news_async_parses_streamed_body(monkeypatch, chunk_size):
+    monkeypatch.setattr(summarizer, "_http", mock_news_client(chunk_size))
+
+    articles = asyncio.run(summarizer.get_news_async("Crypto"))
+
+    assert [article.title for article in articles] == [f"Title {i}" for i in range(5)]
+    assert articles[0].source == "Source 0"
+    assert articles[4].url == "https://example.com/4"
+
+
+def test_summarize_news_skips_content_that_cleans_to_nothing(monkeypatch, tmp_path):
+    async def fail(*args, **kwargs):
+        raise AssertionError("no OpenAI call expected")
+
+    monkeypatch.setattr(summarizer, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(summarizer, "_semantic_cache", None)
+    monkeypatch.setattr(summarizer, "_summary_cache", None)
+    monkeypatch.setattr(summarizer, "embed", fail)
+    monkeypatch.setattr(summarizer, "summarize_batch", fail)
+    articles = [
+        summarizer.Article(
+            title="Title",
+            author=None,
+            url="https://example.com/empty",
+            source="Source",
+            content=" [+2140 chars]",
+            description=None,
+        )
+    ]
+
+    assert asyncio.run(summarizer.summarize_news(articles)) == []
+
+
+def test_get_news_async_retries_timeouts_and_transient_statuses(monkeypatch):
+    body = json.dumps(NEWS_RESPONSE).encode()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        if len(calls) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, content=body)
+
+    monkeypatch.setattr(summarizer, "news_api_backoff", 0)
+    monkeypatch.setattr(
+        summarizer, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    articles = asyncio.run(summarizer.get_news_async("Crypto"))
+
+    assert len(calls) == 3
+    assert len(articles) == 5
+
+
+def test_get_news_async_gives_up_after_retries(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500)
+
+    monkeypatch.setattr(summarizer, "news_api_backoff", 0)
+    monkeypatch.setattr(
+        summarizer, "_http", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+
+    assert asyncio.run(summarizer.get_news_async("Crypto")) == []
+    assert len(calls) == summarizer.news_api_retries + 1
+
+
+class FakeRuns:
+    """
+    Stands in for client.beta.threads.runs, returning the given run statuses in order.
+    """
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.retrieved = 0
+
+    async def retrieve(self, thread_id, run_id):
+        self.retrieved += 1
+        return SimpleNamespace(
+            status=self.statuses.pop(0),
+            last_error=SimpleNamespace(code="server_error", message="boom"),
+            model_dump_json=lambda indent=None: "{}",
+        )
+
+
+@pytest.mark.parametrize("status", ["failed", "cancelled", "expired"])
+def test_wait_for_completion_stops_on_terminal_status(monkeypatch, status):
+    monkeypatch.setattr(summarizer, "poll_interval", 0)
+    runs = FakeRuns(["queued", "in_progress", status])
+    manager = summarizer.AssistantManager()
+    manager.client = SimpleNamespace(
+        beta=SimpleNamespace(threads=SimpleNamespace(runs=runs))
+    )
+    manager.thread = SimpleNamespace(id="thread_1")
+    manager.run = SimpleNamespace(id="run_1")
+
+    asyncio.run(manager.wait_for_completion())
+
+    assert runs.retrieved == 3
+    assert manager.summary is None
+
+
+def test_semantic_cache_threshold(tmp_path):
+    cache = summarizer.SemanticCache(str(tmp_path / "semantic.pkl"), threshold=0.92)
+    cache.set([1.0, 0.0], "first")
+
+    assert cache.get([1.0, 0.1]) == "first"
+    assert cache.get([1.0, 1.0]) is None
+
+
+def test_semantic_cache_drops_expired_entries_on_reload(monkeypatch, tmp_path):
+    path = str(tmp_path / "cache" / "semantic.pkl")
+    now = 1_000_000.0
+    monkeypatch.setattr(summarizer.time, "time", lambda: now)
+    cache = summarizer.SemanticCache(path, ttl=60)
+    cache.set([1.0, 0.0], "old")
+    now += 50
+    cache.set([0.0, 1.0], "new")
+    cache.save()
+
+    now += 30
+    reloaded = summarizer.SemanticCache(path, ttl=60)
+
+    assert reloaded.values == ["new"]
+    assert reloaded.get([1.0, 0.0]) is None
+    assert reloaded.get([0.0, 1.0]) == "new"
+
+
+def test_semantic_cache_caps_entries(tmp_path):
+    cache = summarizer.SemanticCache(str(tmp_path / "semantic.pkl"), max_entries=2)
+    cache.set([1.0, 0.0, 0.0], "a")
+    cache.set([0.0, 1.0, 0.0], "b")
+    cache.set([0.0, 0.0, 1.0], "c")
+
+    assert cache.values == ["b", "c"]
+    assert cache.emb_matrix.shape == (2, 3)
+    assert cache.get([1.0, 0.0, 0.0]) is None
+
+
+def test_semantic_cache_ignores_malformed_pickle(tmp_path):
+    path = tmp_path / "semantic.pkl"
+    path.write_bytes(pickle.dumps({"values": ["a"]}))
+
+    cache = summarizer.SemanticCache(str(path))
+
+    assert cache.emb_matrix is None
+    assert cache.values == []
+
+
+def test_call_function_cache_hit_skips_get_news(monkeypatch):
+    calls = []
+
+    async def fake_get_news(topic):
+        calls.append(topic)
+        return [
+            summarizer.Article(
+                title="Title",
+                author=None,
+                url="https://example.com/1",
+                source="Source",
+                content="Content",
+                description=None,
+            )
+        ]
+
+    monkeypatch.setattr(summarizer, "get_news_async", fake_get_news)
+    monkeypatch.setattr(summarizer, "tool_cache", summarizer.LLMCache())
+    manager = summarizer.AssistantManager()
+    action = {
+        "id": "call_1",
+        "function": {"name": "get_news", "arguments": '{"topic": "Crypto"}'},
+    }
+
+    async def scenario():
+        first = await manager.call_function(action)
+        second = await manager.call_function({**action, "id": "call_2"})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert calls == ["Crypto"]
+    assert second == {"tool_call_id": "call_2", "output": first["output"]}
+    assert json.loads(first["output"])[0]["title"] == "Title"
+
+
+class FakeCompletions:
+    """
+    Stands in for client.chat.completions. Batched requests get the given reply, or a summary
+    for each article when reply is None; requests with more than max_articles articles are
+    rejected as too large.
+    """
+
+    def __init__(self, reply=None, max_articles=None):
+        self.reply = reply
+        self.max_articles = max_articles
+        self.batched = []
+        self.single = []
+
+    async def create(self, model, messages):
+        content = messages[-1]["content"]
+        if "JSON" not in messages[0]["content"]:
+            self.single.append(content)
+            return self.response(f"summary of {content}")
+
+        articles = re.findall(r"ARTICLE \d+:\n(.*)", content)
+        self.batched.append(articles)
+        if self.max_articles is not None and len(articles) > self.max_articles:
+            request = httpx.Request(
+                "POST", "https://api.openai.com/v1/chat/completions"
+            )
+            raise openai.BadRequestError(
+                "context_length_exceeded",
+                response=httpx.Response(400, request=request),
+                body=None,
+            )
+        if self.reply is not None:
+            return self.response(self.reply)
+        summaries = [f"summary of {article}" for article in articles]
+        return self.response(json.dumps({"summaries": summaries}))
+
+    @staticmethod
+    def response(text):
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))]
+        )
+
+
+def use_completions(monkeypatch, completions):
+    monkeypatch.setattr(
+        summarizer,
+        "client",
+        SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+    )
+
+
+def test_summarize_batch_groups_contents_by_size(monkeypatch):
+    completions = FakeCompletions()
+    use_completions(monkeypatch, completions)
+    monkeypatch.setattr(summarizer, "max_batch_chars", 8)
+
+    summaries = asyncio.run(summarizer.summarize_batch(["aaaa", "bbbb", "cccc"]))
+
+    assert summaries == ["summary of aaaa", "summary of bbbb", "summary of cccc"]
+    assert sorted(completions.batched) == [["aaaa", "bbbb"], ["cccc"]]
+    assert completions.single == []
+
+
+def test_summarize_batch_falls_back_when_reply_does_not_parse(monkeypatch):
+    completions = FakeCompletions(reply="not json")
+    use_completions(monkeypatch, completions)
+
+    summaries = asyncio.run(summarizer.summarize_batch(["aaaa", "bbbb"]))
+
+    assert summaries == ["summary of aaaa", "summary of bbbb"]
+    assert sorted(completions.single) == ["aaaa", "bbbb"]
+
+
+def test_summarize_batch_falls_back_when_batch_is_too_large(monkeypatch):
+    completions = FakeCompletions(max_articles=1)
+    use_completions(monkeypatch, completions)
+
+    summaries = asyncio.run(summarizer.summarize_batch(["aaaa", "bbbb"]))
+
+    assert summaries == ["summary of aaaa", "summary of bbbb"]
+    assert completions.batched == [["aaaa", "bbbb"]]
+    assert sorted(completions.single) == ["aaaa", "bbbb"]
+
+
+class FakeResource:
+    """
+    Stands in for an assistants or threads client, recording which calls were made.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append("create")
+        return SimpleNamespace(id=f"{self.prefix}_new")
+
+    async def retrieve(self, **kwargs):
+        self.calls.append("retrieve")
+        return SimpleNamespace(id=next(iter(kwargs.values())))
+
+
+def fake_assistant_client():
+    return SimpleNamespace(
+        beta=SimpleNamespace(
+            assistants=FakeResource("asst"), threads=FakeResource("thread")
+        )
+    )
+
+
+def test_create_reuses_given_assistant_and_thread_ids():
+    manager = summarizer.AssistantManager(assistant_id="asst_x", thread_id="thread_y")
+    manager.client = fake_assistant_client()
+
+    async def scenario():
+        await manager.create_assistant("News", "Summarize", tools=[])
+        await manager.create_thread()
+
+    asyncio.run(scenario())
+
+    assert manager.client.beta.assistants.calls == ["retrieve"]
+    assert manager.client.beta.threads.calls == ["retrieve"]
+    assert (manager.assistant.id, manager.assistant_id) == ("asst_x", "asst_x")
+    assert (manager.thread.id, manager.thread_id) == ("thread_y", "thread_y")
+
+
+def test_create_makes_new_assistant_and_thread_without_ids():
+    manager = summarizer.AssistantManager()
+    manager.client = fake_assistant_client()
+
+    async def scenario():
+        await manager.create_assistant("News", "Summarize", tools=[])
+        await manager.create_thread()
+
+    asyncio.run(scenario())
+
+    assert manager.client.beta.assistants.calls == ["create"]
+    assert manager.client.beta.threads.calls == ["create"]
+    assert manager.assistant_id == "asst_new"
+    assert manager.thread_id == "thread_new"